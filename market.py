@@ -1,152 +1,129 @@
+import asyncio
 import datetime
 import logging.config
-from environs import Env
-from seller import download_stock
 
-import requests
+import httpx
+import orjson
+from environs import Env
 
-from seller import divide, price_conversion
+from seller import (
+    catalog_stocks,
+    convert_prices,
+    create_client,
+    download_stock,
+    rate_limiter,
+    request_with_retry,
+    select_offers,
+    upload_batches,
+)
 
 logger = logging.getLogger(__file__)
 
+ENDPOINT_URL = "https://api.partner.market.yandex.ru/"
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Host": "api.partner.market.yandex.ru",
+}
+
+# Запросов в минуту к одному методу одной кампании Яндекс.Маркет.
+YM_RATE_LIMIT = 100
+
 
-def get_product_list(page, campaign_id, access_token):
-    """Получает список товаров из Яндекс.Маркет.
+async def get_product_list_async(client, page, campaign_id, access_token):
+    """Асинхронно получает страницу списка товаров из Яндекс.Маркет.
 
     Args:
-        page (str): Номер страницы.
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        page (str): Токен страницы.
         campaign_id (str): Идентификатор кампании продавца.
         access_token (str): ТОКЕН доступа к API Яндекс.Маркет.
 
     Returns:
         dict: Результат запроса с товарами.
-
-    Пример корректного исполнения:
-        >>> result = get_product_list("", "Идентификатор кампании", "ТОКЕН")
-        True
-
-    Пример некорректного исполнения:
-        >>> get_product_list("", "Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
-    }
+    headers = {**HEADERS, "Authorization": f"Bearer {access_token}"}
     payload = {
         "page_token": page,
         "limit": 200,
     }
-    url = endpoint_url + f"campaigns/{campaign_id}/offer-mapping-entries"
-    response = requests.get(url, headers=headers, params=payload)
-    response.raise_for_status()
-    response_object = response.json()
+    url = ENDPOINT_URL + f"campaigns/{campaign_id}/offer-mapping-entries"
+    limiter = rate_limiter(("market", "list", campaign_id), YM_RATE_LIMIT)
+    response_object = await request_with_retry(
+        client, "GET", url, limiter, headers=headers, params=payload
+    )
     return response_object.get("result")
 
 
-def update_stocks(stocks, campaign_id, access_token):
-     """Обновляет остатки товаров на Яндекс.Маркет.
+async def update_stocks_async(client, stocks, campaign_id, access_token):
+    """Асинхронно обновляет остатки товаров на Яндекс.Маркет.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         stocks (list): Список словарей с данными об остатках.
         campaign_id (str): Идентификатор кампании продавца.
         access_token (str): ТОКЕН доступа к API Яндекс.Маркет.
 
     Returns:
         dict: Ответ от API Яндекс.Маркет о результате обновления.
-
-    Пример корректного исполнения:
-        >>> stocks = [{"sku": "111", "warehouseId": "222", "items": []}]
-        >>> update_stocks(stocks, "Идентификатор кампании", "ТОКЕН")
-        True
-
-    Пример некорректного исполнения:
-        >>> update_stocks([Пустой cписок или неверные SKU], "Идентификатор кампании", "ТОКЕН")
-        Error
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
-    }
-    payload = {"skus": stocks}
-    url = endpoint_url + f"campaigns/{campaign_id}/offers/stocks"
-    response = requests.put(url, headers=headers, json=payload)
-    response.raise_for_status()
-    response_object = response.json()
-    return response_object
+    headers = {**HEADERS, "Authorization": f"Bearer {access_token}"}
+    payload = orjson.dumps({"skus": stocks})
+    url = ENDPOINT_URL + f"campaigns/{campaign_id}/offers/stocks"
+    limiter = rate_limiter(("market", "stocks", campaign_id), YM_RATE_LIMIT)
+    return await request_with_retry(
+        client, "PUT", url, limiter, headers=headers, content=payload
+    )
 
 
-def update_price(prices, campaign_id, access_token):
-    """
-    Обновляет цены товаров на Яндекс.Маркет.
+async def update_price_async(client, prices, campaign_id, access_token):
+    """Асинхронно обновляет цены товаров на Яндекс.Маркет.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         prices (list): Список словарей с данными о ценах.
         campaign_id (str): Идентификатор кампании продавца.
         access_token (str): Токен доступа к API Яндекс.Маркет.
 
     Returns:
         dict: Ответ от API Яндекс.Маркет о результате обновления цен.
-
-    Пример корректного исполнения:
-        >>> prices = create_prices()
-        >>> update_price(prices, "Идентификатор кампании", "ТОКЕН")
-        True
-
-    Пример некорректного исполнения:
-        >>> update_price([{"id": "111"}, без цены], "Идентификатор кампании", "ТОКЕН")
-        Error
     """
-    endpoint_url = "https://api.partner.market.yandex.ru/"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-        "Host": "api.partner.market.yandex.ru",
-    }
-    payload = {"offers": prices}
-    url = endpoint_url + f"campaigns/{campaign_id}/offer-prices/updates"
-    response = requests.post(url, headers=headers, json=payload)
-    response.raise_for_status()
-    response_object = response.json()
-    return response_object
+    headers = {**HEADERS, "Authorization": f"Bearer {access_token}"}
+    payload = orjson.dumps({"offers": prices})
+    url = ENDPOINT_URL + f"campaigns/{campaign_id}/offer-prices/updates"
+    limiter = rate_limiter(("market", "prices", campaign_id), YM_RATE_LIMIT)
+    return await request_with_retry(
+        client, "POST", url, limiter, headers=headers, content=payload
+    )
 
 
-def get_offer_ids(campaign_id, market_token):
-    """Получает SKU артикулы товаров из Яндекс.Маркет.
+async def get_offer_ids_async(client, campaign_id, market_token):
+    """Асинхронно получает SKU артикулы товаров из Яндекс.Маркет.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         campaign_id (str): Идентификатор кампании продавца.
         market_token (str): Токен доступа к API Яндекс.Маркет.
 
     Returns:
         list: Список строк SKU артикулов всех товаров кампании.
-
-    Пример корректного исполнения:
-        >>> get_offer_ids("Идентификатор кампании", "ТОКЕН")
-        True
-
-    Пример некорректного исполнения:
-        >>> get_offer_ids("Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    page = ""
-    product_list = []
-    while True:
-        some_prod = get_product_list(page, campaign_id, market_token)
-        product_list.extend(some_prod.get("offerMappingEntries"))
-        page = some_prod.get("paging").get("nextPageToken")
-        if not page:
-            break
     offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer").get("shopSku"))
+    request = asyncio.create_task(
+        get_product_list_async(client, "", campaign_id, market_token)
+    )
+    while request:
+        some_prod = await request
+        entries = some_prod.get("offerMappingEntries") or []
+        request = None
+        if entries and (page := (some_prod.get("paging") or {}).get("nextPageToken")):
+            # Отдаём управление, чтобы запрос следующей страницы начал
+            # выполняться до разбора текущей
+            request = asyncio.create_task(
+                get_product_list_async(client, page, campaign_id, market_token)
+            )
+            await asyncio.sleep(0)
+        offer_ids.extend(product["offer"]["shopSku"] for product in entries)
     return offer_ids
 
 
@@ -154,7 +131,7 @@ def create_stocks(watch_remnants, offer_ids, warehouse_id):
     """Формирует список остатков для Яндекс.Маркет.
 
     Args:
-        watch_remnants (list): Данные об остатках от поставщика.
+        watch_remnants (pandas.DataFrame): Данные об остатках от поставщика.
         offer_ids (list): Артикулы товаров на Яндекс.Маркет.
         warehouse_id (str): Идентификатор склада в Яндекс.Маркет.
 
@@ -162,56 +139,25 @@ def create_stocks(watch_remnants, offer_ids, warehouse_id):
         list: Список словарей для обновления остатков.
 
     Пример корректного исполнения:
-        >>> remnants = [{"Код": "111", "Количество": "5"}]
+        >>> remnants = pd.DataFrame([{"Код": "111", "Количество": "5"}])
         >>> ids = ["111", "222"]
         >>> create_stocks(remnants, ids, "Идентификатор склада")
         5
 
     Пример некорректного исполнения:
-        >>> create_stocks([пустой список], [пустой список], None)
+        >>> create_stocks(pd.DataFrame(columns=["Код", "Количество"]), [], None)
         Вернёт пустой список
     """
-    # Уберем то, что не загружено в market
-    stocks = list()
+    catalog = catalog_stocks(watch_remnants, offer_ids)
     date = str(datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z")
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append(
-                {
-                    "sku": str(watch.get("Код")),
-                    "warehouseId": warehouse_id,
-                    "items": [
-                        {
-                            "count": stock,
-                            "type": "FIT",
-                            "updatedAt": date,
-                        }
-                    ],
-                }
-            )
-            offer_ids.remove(str(watch.get("Код")))
-    # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append(
-            {
-                "sku": offer_id,
-                "warehouseId": warehouse_id,
-                "items": [
-                    {
-                        "count": 0,
-                        "type": "FIT",
-                        "updatedAt": date,
-                    }
-                ],
-            }
-        )
+    stocks = [
+        {
+            "sku": code,
+            "warehouseId": warehouse_id,
+            "items": [{"count": stock, "type": "FIT", "updatedAt": date}],
+        }
+        for code, stock in zip(catalog["Код"], catalog["stock"].tolist())
+    ]
     return stocks
 
 
@@ -219,46 +165,49 @@ def create_prices(watch_remnants, offer_ids):
     """Формирует список цен для Яндекс.Маркет.
 
     Args:
-        watch_remnants (list): Данные о ценах от поставщика.
+        watch_remnants (pandas.DataFrame): Данные о ценах от поставщика.
         offer_ids (list): Артикулы товаров на Яндекс.Маркет.
 
     Returns:
         list: Список словарей в формате API Яндекс.Маркет для обновления цен.
 
     Пример корректного исполнения:
-        >>> remnants = [{"Код": "111", "Цена": "5'990.00 руб."}]
+        >>> remnants = pd.DataFrame([{"Код": "111", "Цена": "5'990.00 руб."}])
         >>> ids = ["111"]
         >>> create_prices(remnants, ids)
         5990
 
     Пример некорректного исполнения:
-        >>> create_prices([{"Код": "999"}], [])
+        >>> create_prices(pd.DataFrame([{"Код": "999", "Цена": "1"}]), [])
         Вернёт пустой список
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "id": str(watch.get("Код")),
-                # "feed": {"id": 0},
-                "price": {
-                    "value": int(price_conversion(watch.get("Цена"))),
-                    # "discountBase": 0,
-                    "currencyId": "RUR",
-                    # "vat": 0,
-                },
-                # "marketSku": 0,
-                # "shopSku": "string",
-            }
-            prices.append(price)
+    matched = select_offers(watch_remnants, offer_ids)
+    values = convert_prices(matched["Цена"]).astype(int).tolist()
+    prices = [
+        {
+            "id": code,
+            # "feed": {"id": 0},
+            "price": {
+                "value": value,
+                # "discountBase": 0,
+                "currencyId": "RUR",
+                # "vat": 0,
+            },
+            # "marketSku": 0,
+            # "shopSku": "string",
+        }
+        for code, value in zip(matched["Код"], values)
+    ]
     return prices
 
 
-async def upload_prices(watch_remnants, campaign_id, market_token):
+async def upload_prices(client, watch_remnants, offer_ids, campaign_id, market_token):
     """Загружает цены товаров на Яндекс.Маркет.
 
     Args:
-        watch_remnants (list): Данные от поставщика.
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Артикулы товаров кампании (см. get_offer_ids_async()).
         campaign_id (str): Идентификатор кампании.
         market_token (str): Токен доступа к API Яндекс.Маркет.
 
@@ -266,25 +215,33 @@ async def upload_prices(watch_remnants, campaign_id, market_token):
         list: Список всех сформированных цен.
 
     Пример корректного исполнения:
-        >>> upload_prices(remnants, "Идентификатор кампании", "ТОКЕН")
+        >>> upload_prices(client, remnants, ids, "Идентификатор кампании", "ТОКЕН")
         True
 
     Пример некорректного исполнения:
-        >>> upload_prices([], "Идентификатор кампании", "ТОКЕН")
+        >>> upload_prices(client, [], [], "Идентификатор кампании", "ТОКЕН")
         Error
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_prices in list(divide(prices, 500)):
-        update_price(some_prices, campaign_id, market_token)
+    await upload_batches(
+        prices,
+        500,
+        lambda some_prices: update_price_async(
+            client, some_prices, campaign_id, market_token
+        ),
+    )
     return prices
 
 
-async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id):
-     """Загружает остатки товаров на Яндекс.Маркет.
+async def upload_stocks(
+    client, watch_remnants, offer_ids, campaign_id, market_token, warehouse_id
+):
+    """Загружает остатки товаров на Яндекс.Маркет.
 
     Args:
-        watch_remnants (list): Данные от поставщика.
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Артикулы товаров кампании (см. get_offer_ids_async()).
         campaign_id (str): Идентификатор кампании.
         market_token (str): Токен доступа к API Яндекс.Маркет.
         warehouse_id (str): Идентификатор склада.
@@ -295,23 +252,68 @@ async def upload_stocks(watch_remnants, campaign_id, market_token, warehouse_id)
             stocks (list): Все товары с остатками.
 
     Пример корректного исполнения:
-        >>> upload_stocks(remnants, "Идентификатор кампании", "ТОКЕН", "Идентификатор склада")
+        >>> upload_stocks(client, remnants, ids, "Идентификатор кампании", "ТОКЕН", "Идентификатор склада")
         True
 
     Пример некорректного исполнения:
-        >>> upload_stocks(None, None, None, None)
+        >>> upload_stocks(client, None, None, None, None, None)
         Expect
     """
-    offer_ids = get_offer_ids(campaign_id, market_token)
     stocks = create_stocks(watch_remnants, offer_ids, warehouse_id)
-    for some_stock in list(divide(stocks, 2000)):
-        update_stocks(some_stock, campaign_id, market_token)
-    not_empty = list(
-        filter(lambda stock: (stock.get("items")[0].get("count") != 0), stocks)
+    await upload_batches(
+        stocks,
+        2000,
+        lambda some_stock: update_stocks_async(
+            client, some_stock, campaign_id, market_token
+        ),
     )
+    not_empty = [stock for stock in stocks if stock["items"][0]["count"] != 0]
     return not_empty, stocks
 
 
+async def sync_campaign(
+    client, watch_remnants, campaign_id, warehouse_id, market_token
+):
+    """Обновляет остатки и цены одной кампании Яндекс.Маркет.
+
+    Артикулы кампании запрашиваются один раз, после чего остатки и цены
+    загружаются параллельно.
+
+    Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        campaign_id (str): Идентификатор кампании.
+        warehouse_id (str): Идентификатор склада.
+        market_token (str): Токен доступа к API Яндекс.Маркет.
+    """
+    offer_ids = await get_offer_ids_async(client, campaign_id, market_token)
+    await asyncio.gather(
+        upload_stocks(
+            client, watch_remnants, offer_ids, campaign_id, market_token, warehouse_id
+        ),
+        upload_prices(client, watch_remnants, offer_ids, campaign_id, market_token),
+    )
+
+
+async def sync_campaigns(watch_remnants, campaigns, market_token):
+    """Параллельно синхронизирует несколько кампаний через общий HTTP/2-клиент.
+
+    Args:
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        campaigns (list): Пары (идентификатор кампании, идентификатор склада).
+        market_token (str): Токен доступа к API Яндекс.Маркет.
+    """
+    async with create_client() as client:
+        await asyncio.gather(
+            *[
+                sync_campaign(
+                    client, watch_remnants, campaign_id, warehouse_id, market_token
+                )
+                for campaign_id, warehouse_id in campaigns
+            ]
+        )
+
+
 def main():
     """
     Основная функция для синхронизации с Яндекс.Маркет.
@@ -331,27 +333,16 @@ def main():
     warehouse_dbs_id = env.str("WAREHOUSE_DBS_ID")
 
     watch_remnants = download_stock()
+    campaigns = [
+        (campaign_fbs_id, warehouse_fbs_id),  # FBS
+        (campaign_dbs_id, warehouse_dbs_id),  # DBS
+    ]
     try:
-        # FBS
-        offer_ids = get_offer_ids(campaign_fbs_id, market_token)
-        # Обновить остатки FBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_fbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_fbs_id, market_token)
-        # Поменять цены FBS
-        upload_prices(watch_remnants, campaign_fbs_id, market_token)
-
-        # DBS
-        offer_ids = get_offer_ids(campaign_dbs_id, market_token)
-        # Обновить остатки DBS
-        stocks = create_stocks(watch_remnants, offer_ids, warehouse_dbs_id)
-        for some_stock in list(divide(stocks, 2000)):
-            update_stocks(some_stock, campaign_dbs_id, market_token)
-        # Поменять цены DBS
-        upload_prices(watch_remnants, campaign_dbs_id, market_token)
-    except requests.exceptions.ReadTimeout:
+        # Обновить остатки и цены FBS и DBS
+        asyncio.run(sync_campaigns(watch_remnants, campaigns, market_token))
+    except httpx.TimeoutException:
         print("Превышено время ожидания...")
-    except requests.exceptions.ConnectionError as error:
+    except httpx.ConnectError as error:
         print(error, "Ошибка соединения")
     except Exception as error:
         print(error, "ERROR_2")
@@ -1,37 +1,156 @@
+import asyncio
 import io
+import json
 import logging.config
 import os
 import re
+import shutil
 import zipfile
-from environs import Env
+from pathlib import Path
 
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
 import requests
+from aiolimiter import AsyncLimiter
+from environs import Env
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__file__)
 
+PRODUCT_LIST_URL = "https://api-seller.ozon.ru/v2/product/list"
+PRICES_URL = "https://api-seller.ozon.ru/v1/product/import/prices"
+STOCKS_URL = "https://api-seller.ozon.ru/v1/product/import/stocks"
+CASIO_URL = "https://timeworld.ru/upload/files/ostatki.zip"
+
+# Разобранные остатки и валидаторы (ETag/Last-Modified) последней загрузки.
+STOCK_CACHE_DIR = Path.home() / ".cache" / "seller"
+STOCK_CACHE_FILE = STOCK_CACHE_DIR / "casio.pkl"
+STOCK_CACHE_META = STOCK_CACHE_DIR / "casio.meta"
+
+# Целая часть цены (до первой точки) и всё, что не является цифрой.
+_INT_PART = re.compile(r"[^.]*")
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+# Сессия для скачивания остатков поставщика с повтором при сбоях сервера.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        ),
+    ),
+)
+
+# Сколько пакетов остатков/цен отправляется одновременно.
+UPLOAD_CONCURRENCY = 16
+
+# Запросов в минуту к одному методу Ozon и повторы при 429/5xx.
+OZON_RATE_LIMIT = 80
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+# Верхняя граница паузы по заголовку Retry-After, в секундах.
+MAX_RETRY_AFTER = 60
+
+_RATE_LIMITERS = {}
+
+
+def create_client():
+    """Создаёт HTTP/2-клиент с ограниченным пулом соединений.
+
+    Returns:
+        httpx.AsyncClient: Клиент для асинхронных запросов к API.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        timeout=httpx.Timeout(30.0),
+    )
+
+
+def rate_limiter(key, max_rate, time_period=60):
+    """Возвращает общий ограничитель частоты запросов для ключа.
+
+    Args:
+        key (tuple): Ключ ограничителя, например (API, метод, кампания).
+        max_rate (int): Сколько запросов разрешено за time_period.
+        time_period (int): Длина окна в секундах.
+
+    Returns:
+        AsyncLimiter: Ограничитель, единый для всех запросов с этим ключом.
+    """
+    if key not in _RATE_LIMITERS:
+        _RATE_LIMITERS[key] = AsyncLimiter(max_rate, time_period)
+    return _RATE_LIMITERS[key]
+
+
+def retry_delay(retry_after, attempt):
+    """Считает паузу перед повтором запроса.
+
+    Args:
+        retry_after (str): Значение заголовка Retry-After или None.
+        attempt (int): Номер неудачной попытки, начиная с нуля.
+
+    Returns:
+        int: Пауза в секундах, не больше MAX_RETRY_AFTER.
+    """
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), MAX_RETRY_AFTER)
+    return min(2**attempt, 30)
 
-def get_product_list(last_id, client_id, seller_token):
-    """Получает список товаров магазина Ozon.
+
+async def request_with_retry(client, method, url, limiter, **kwargs):
+    """Отправляет запрос с учётом лимитов API и повторяет его при 429/5xx.
+
+    Сетевые сбои (обрыв соединения, таймаут, ошибка протокола) тоже
+    повторяются с той же паузой.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        method (str): HTTP-метод.
+        url (str): Адрес метода API.
+        limiter (AsyncLimiter): Ограничитель частоты запросов.
+        **kwargs: Параметры запроса (headers, json и т.д.).
+
+    Returns:
+        dict: Ответ API.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with limiter:
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(retry_delay(None, attempt))
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        delay = retry_delay(response.headers.get("Retry-After"), attempt)
+        await asyncio.sleep(delay)
+
+
+async def get_product_list_async(client, last_id, client_id, seller_token):
+    """Асинхронно получает страницу списка товаров магазина Ozon.
+
+    Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         last_id (str): Идентификатор последнего полученного товара.
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для авторизации в API Ozon.
 
     Returns:
         dict: Результат запроса, содержащий список товаров и метаданные пагинации.
-
-    Пример корректного исполнения:
-        >>> get_product_list("", "id клиента", "ТОКЕН")
-        >>> "items" in result
-        True
-
-    Пример некорректного исполнения:
-        >>> get_product_list("", "Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    url = "https://api-seller.ozon.ru/v2/product/list"
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
@@ -43,112 +162,204 @@ def get_product_list(last_id, client_id, seller_token):
         "last_id": last_id,
         "limit": 1000,
     }
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    response_object = response.json()
+    limiter = rate_limiter(("ozon", "list", client_id), OZON_RATE_LIMIT)
+    response_object = await request_with_retry(
+        client,
+        "POST",
+        PRODUCT_LIST_URL,
+        limiter,
+        json=payload,
+        headers=headers,
+    )
     return response_object.get("result")
 
 
-def get_offer_ids(client_id, seller_token):
-     """Получает все артикулы товаров магазина Ozon.
+async def get_offer_ids_async(client, client_id, seller_token):
+    """Асинхронно получает все артикулы товаров магазина Ozon.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для авторизации в API Ozon.
 
     Returns:
         list: Список строк-артикулов всех товаров магазина.
-
-    Пример корректного исполнения:
-        >>> ids = get_offer_ids("id клиента", "ТОКЕН")
-        
-    Пример некорректного исполнения:
-        >>> get_offer_ids("Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    last_id = ""
-    product_list = []
-    while True:
-        some_prod = get_product_list(last_id, client_id, seller_token)
-        product_list.extend(some_prod.get("items"))
-        total = some_prod.get("total")
-        last_id = some_prod.get("last_id")
-        if total == len(product_list):
-            break
     offer_ids = []
-    for product in product_list:
-        offer_ids.append(product.get("offer_id"))
+    fetched = 0
+    request = asyncio.create_task(
+        get_product_list_async(client, "", client_id, seller_token)
+    )
+    while request:
+        some_prod = await request
+        items = some_prod.get("items") or []
+        fetched += len(items)
+        request = None
+        if (
+            items
+            and (last_id := some_prod.get("last_id"))
+            and fetched < some_prod.get("total")
+        ):
+            # Отдаём управление, чтобы запрос следующей страницы начал
+            # выполняться до разбора текущей
+            request = asyncio.create_task(
+                get_product_list_async(client, last_id, client_id, seller_token)
+            )
+            await asyncio.sleep(0)
+        offer_ids.extend(product["offer_id"] for product in items)
     return offer_ids
 
 
-def update_price(prices: list, client_id, seller_token):
-    """Обновляет цены товаров на Ozon через API.
+async def update_price_async(client, prices, client_id, seller_token):
+    """Асинхронно обновляет цены товаров на Ozon.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         prices (list): Список словарей с данными о ценах товаров.
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для авторизации в API Ozon.
 
     Returns:
         dict: Ответ от API Ozon о результате обновления цен.
-
-    Пример корректного исполнения:
-        >>> prices = create_prices()
-        >>> result = update_price(prices, "id клиента", "ТОКЕН")
-        True
-
-    Пример некорректного исполнения:
-        >>> update_price([Пустой файл или неверные артикулы], "Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    url = "https://api-seller.ozon.ru/v1/product/import/prices"
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
+        "Content-Type": "application/json",
     }
-    payload = {"prices": prices}
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    payload = orjson.dumps({"prices": prices})
+    limiter = rate_limiter(("ozon", "prices", client_id), OZON_RATE_LIMIT)
+    return await request_with_retry(
+        client,
+        "POST",
+        PRICES_URL,
+        limiter,
+        content=payload,
+        headers=headers,
+    )
 
 
-def update_stocks(stocks: list, client_id, seller_token):
-    """Обновляет остатки товаров на Ozon через API.
+async def update_stocks_async(client, stocks, client_id, seller_token):
+    """Асинхронно обновляет остатки товаров на Ozon.
 
     Args:
+        client (httpx.AsyncClient): Клиент для запросов к API.
         stocks (list): Список словарей с данными об остатках товаров.
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для авторизации в API Ozon.
 
     Returns:
         dict: Ответ от API Ozon о результате обновления остатков.
-
-    Пример корректного исполнения:
-        >>> stocks = create_stocks()
-        >>> result = update_stocks(stocks, "id клиента", "ТОКЕН")
-        >>> isinstance(result, dict)
-        True
-
-    Пример некорректного исполнения:
-        >>> update_stocks([Неверные артикулы], "Некорректный id", "Некорректный ТОКЕН")
-        Error
     """
-    url = "https://api-seller.ozon.ru/v1/product/import/stocks"
     headers = {
         "Client-Id": client_id,
         "Api-Key": seller_token,
+        "Content-Type": "application/json",
     }
-    payload = {"stocks": stocks}
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    payload = orjson.dumps({"stocks": stocks})
+    limiter = rate_limiter(("ozon", "stocks", client_id), OZON_RATE_LIMIT)
+    return await request_with_retry(
+        client,
+        "POST",
+        STOCKS_URL,
+        limiter,
+        content=payload,
+        headers=headers,
+    )
+
+
+def stock_cache_headers():
+    """Возвращает заголовки условного запроса по валидаторам из кэша.
+
+    Returns:
+        dict: If-None-Match и If-Modified-Since или пустой словарь,
+            если кэша нет или его не удалось прочитать.
+    """
+    if not (STOCK_CACHE_FILE.exists() and STOCK_CACHE_META.exists()):
+        return {}
+    try:
+        meta = json.loads(STOCK_CACHE_META.read_text())
+    except (OSError, ValueError) as error:
+        logger.warning("Не удалось прочитать кэш остатков: %s", error)
+        return {}
+    if not isinstance(meta, dict):
+        return {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def fetch_stock_archive(headers):
+    """Скачивает архив с остатками в память.
+
+    Args:
+        headers (dict): Заголовки условного запроса.
+
+    Returns:
+        tuple: (buffer, meta) - архив и его валидаторы, либо None,
+            если файл не изменился (ответ 304).
+    """
+    buffer = io.BytesIO()
+    with _SESSION.get(CASIO_URL, headers=headers, stream=True) as response:
+        if headers and response.status_code == 304:
+            return None
+        response.raise_for_status()
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, buffer)
+        meta = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    return buffer, meta
+
+
+def replace_file(path, write):
+    """Записывает файл через временный и атомарно подменяет им path.
+
+    Args:
+        path (pathlib.Path): Итоговый файл.
+        write (callable): Функция, записывающая данные по переданному пути.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def save_stock_cache(watch_remnants, meta):
+    """Сохраняет остатки и валидаторы загрузки в кэш.
+
+    Остатки записываются раньше валидаторов, чтобы после сбоя новые
+    валидаторы не указывали на старые остатки.
+
+    Args:
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        meta (dict): ETag и Last-Modified ответа поставщика.
+    """
+    try:
+        STOCK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        replace_file(STOCK_CACHE_FILE, watch_remnants.to_pickle)
+        replace_file(
+            STOCK_CACHE_META, lambda path: path.write_text(json.dumps(meta))
+        )
+    except OSError as error:
+        logger.warning("Не удалось сохранить кэш остатков: %s", error)
 
 
 def download_stock():
     """Скачивает файл ostatki с сайта casio
 
+    Если файл на сайте не изменился с прошлой загрузки (ответ 304),
+    возвращаются остатки из локального кэша. Если кэш не читается,
+    файл скачивается заново без условных заголовков.
+
     Returns:
-        list: Список словарей с информацией о товарах (Артикул, Количество, Цена).
+        pandas.DataFrame: Таблица с информацией о товарах (Код, Количество, Цена).
 
     Пример корректного исполнения:
         >>> download_stock()
@@ -158,21 +369,24 @@ def download_stock():
         Сайт недоступен    
     """
     # Скачать остатки с сайта
-    casio_url = "https://timeworld.ru/upload/files/ostatki.zip"
-    session = requests.Session()
-    response = session.get(casio_url)
-    response.raise_for_status()
-    with response, zipfile.ZipFile(io.BytesIO(response.content)) as archive:
-        archive.extractall(".")
-    # Создаем список остатков часов:
-    excel_file = "ostatki.xls"
-    watch_remnants = pd.read_excel(
-        io=excel_file,
-        na_values=None,
-        keep_default_na=False,
-        header=17,
-    ).to_dict(orient="records")
-    os.remove("./ostatki.xls")  # Удалить файл
+    fetched = fetch_stock_archive(stock_cache_headers())
+    if fetched is None:
+        try:
+            return pd.read_pickle(STOCK_CACHE_FILE)
+        except Exception as error:
+            logger.warning("Не удалось прочитать кэш остатков: %s", error)
+            fetched = fetch_stock_archive({})
+    buffer, meta = fetched
+    # Создаем список остатков часов прямо из архива в памяти:
+    with zipfile.ZipFile(buffer) as archive, archive.open("ostatki.xls") as excel_file:
+        watch_remnants = pd.read_excel(
+            io=excel_file,
+            engine="xlrd",
+            na_values=None,
+            keep_default_na=False,
+            header=17,
+        )
+    save_stock_cache(watch_remnants, meta)
     return watch_remnants
 
 
@@ -180,75 +394,134 @@ def create_stocks(watch_remnants, offer_ids):
     """Формирует список остатков для обновления.
 
     Args:
-        watch_remnants (list): Список словарей с данными от поставщика.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
         offer_ids (list): Список артикулов товаров.
 
     Returns:
         list: Список словарей для обновления остатков.
 
     Пример корректного исполнения:
-        >>> remnants = [{"Артикул": "111", "Количество": "5"}]
+        >>> remnants = pd.DataFrame([{"Код": "111", "Количество": "5"}])
         >>> ids = ["111", "222"]
         >>> create_stocks(remnants, ids)
         5
 
     Пример некорректного исполнения:
-        >>> create_stocks([пустой список], [пустой список])
-        None
+        >>> create_stocks(pd.DataFrame(columns=["Код", "Количество"]), [])
+        []
     """
-    # Уберем то, что не загружено в seller
-    stocks = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            count = str(watch.get("Количество"))
-            if count == ">10":
-                stock = 100
-            elif count == "1":
-                stock = 0
-            else:
-                stock = int(watch.get("Количество"))
-            stocks.append({"offer_id": str(watch.get("Код")), "stock": stock})
-            offer_ids.remove(str(watch.get("Код")))
-    # Добавим недостающее из загруженного:
-    for offer_id in offer_ids:
-        stocks.append({"offer_id": offer_id, "stock": 0})
-    return stocks
+    stocks = catalog_stocks(watch_remnants, offer_ids)
+    return stocks.rename(columns={"Код": "offer_id"})[["offer_id", "stock"]].to_dict(
+        orient="records"
+    )
 
 
 def create_prices(watch_remnants, offer_ids):
     """Формирует список цен для обновления.
 
     Args:
-        watch_remnants (list): Список словарей с данными от поставщика.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
         offer_ids (list): Список артикулов.
 
     Returns:
         list: Список словарей для обновления цен.
 
     Пример корректного исполнения:
-        >>> remnants = [{"Артикул": "111", "Цена": "12 345.67 руб."}]
+        >>> remnants = pd.DataFrame([{"Код": "111", "Цена": "12 345.67 руб."}])
         >>> ids = ["111"]
         >>> create_prices(remnants, ids)
         '12345'
 
     Пример некорректного исполнения:
-        >>> create_prices([{"Код": "111"}], [пустой список])
-        [пустой список]
+        >>> create_prices(pd.DataFrame([{"Код": "111", "Цена": "1"}]), [])
+        []
     """
-    prices = []
-    for watch in watch_remnants:
-        if str(watch.get("Код")) in offer_ids:
-            price = {
-                "auto_action_enabled": "UNKNOWN",
-                "currency_code": "RUB",
-                "offer_id": str(watch.get("Код")),
-                "old_price": "0",
-                "price": price_conversion(watch.get("Цена")),
-            }
-            prices.append(price)
+    matched = select_offers(watch_remnants, offer_ids)
+    prices = pd.DataFrame(
+        {
+            "auto_action_enabled": "UNKNOWN",
+            "currency_code": "RUB",
+            "offer_id": matched["Код"],
+            "old_price": "0",
+            "price": convert_prices(matched["Цена"]),
+        }
+    ).to_dict(orient="records")
     return prices
 
 
+def select_offers(watch_remnants, offer_ids):
+    """Оставляет строки поставщика, артикулы которых есть на маркетплейсе.
+
+    Args:
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Список артикулов.
+
+    Returns:
+        pandas.DataFrame: Подходящие строки, колонка "Код" приведена к строке.
+    """
+    codes = watch_remnants["Код"].astype(str)
+    return watch_remnants.assign(**{"Код": codes})[codes.isin(set(offer_ids))]
+
+
+def catalog_stocks(watch_remnants, offer_ids):
+    """Сопоставляет артикулы маркетплейса с остатками поставщика за один проход.
+
+    Артикулы, которых нет у поставщика, получают нулевой остаток.
+
+    Args:
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Список артикулов.
+
+    Returns:
+        pandas.DataFrame: Колонки "Код" и "stock", по строке на артикул.
+    """
+    codes = pd.DataFrame(
+        {"Код": pd.Series(list(dict.fromkeys(offer_ids)), dtype=object)}
+    )
+    remnants = (
+        watch_remnants[["Код", "Количество"]]
+        .astype({"Код": str})
+        .drop_duplicates("Код")
+    )
+    remnants = pd.DataFrame(
+        {"Код": remnants["Код"], "stock": stock_counts(remnants["Количество"])}
+    )
+    stocks = codes.merge(remnants, on="Код", how="left")
+    stocks["stock"] = stocks["stock"].fillna(0).astype(int)
+    return stocks
+
+
+def stock_counts(quantities):
+    """Переводит колонку "Количество" поставщика в числовые остатки.
+
+    ">10" становится 100, "1" - нулём, остальное - целым числом.
+
+    Args:
+        quantities (pandas.Series): Количество в формате поставщика.
+
+    Returns:
+        numpy.ndarray: Остатки для маркетплейса.
+    """
+    count = quantities.astype(str)
+    number = pd.to_numeric(count, errors="coerce").fillna(0).astype(int)
+    return np.where(count == ">10", 100, np.where(count == "1", 0, number))
+
+
+def convert_prices(prices):
+    """Векторная версия price_conversion() для колонки цен.
+
+    Args:
+        prices (pandas.Series): Цены в произвольном формате с разделителями.
+
+    Returns:
+        pandas.Series: Целочисленные представления цен без разделителей.
+    """
+    integer_part = prices.astype(str).str.extract(
+        f"({_INT_PART.pattern})", expand=False
+    )
+    return integer_part.str.replace(_NON_DIGIT, "", regex=True)
+
+
 def price_conversion(price: str) -> str:
     """Преобразует строку с ценой в целочисленный строковый формат.
 
@@ -264,7 +537,7 @@ def price_conversion(price: str) -> str:
         >>> price_conversion("111.11")
         '111'
     """
-    return re.sub("[^0-9]", "", price.split(".")[0])
+    return _NON_DIGIT.sub("", _INT_PART.match(price).group())
 
 
 def divide(lst: list, n: int):
@@ -273,32 +546,67 @@ def divide(lst: list, n: int):
         yield lst[i : i + n]
 
 
-async def upload_prices(watch_remnants, client_id, seller_token):
+async def upload_batches(items, size, send, concurrency=UPLOAD_CONCURRENCY):
+    """Отправляет items частями по size через очередь с concurrency обработчиками.
+
+    Части создаются по мере освобождения очереди, поэтому в памяти
+    одновременно находится не больше concurrency неотправленных частей.
+
+    Args:
+        items (list): Элементы для отправки.
+        size (int): Размер одной части.
+        send (callable): Корутинная функция, отправляющая одну часть.
+        concurrency (int): Число одновременно работающих обработчиков.
+    """
+    queue = asyncio.Queue(maxsize=concurrency)
+
+    async def produce():
+        for batch in divide(items, size):
+            await queue.put(batch)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def consume():
+        while (batch := await queue.get()) is not None:
+            await send(batch)
+
+    await asyncio.gather(produce(), *[consume() for _ in range(concurrency)])
+
+
+async def upload_prices(client, watch_remnants, offer_ids, client_id, seller_token):
     """Загружает цены товаров на Ozon.
 
-    Получает список товаров с Ozon, формирует цены и отправляет их
+    Формирует цены для уже полученных артикулов Ozon и отправляет их
     частями по 1000 товаров за запрос.
 
     Args:
-        watch_remnants (list): Данные от поставщика.
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Артикулы товаров магазина (см. get_offer_ids_async()).
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для Ozon.
 
     Returns:
         list: Список всех сформированных цен.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
     prices = create_prices(watch_remnants, offer_ids)
-    for some_price in list(divide(prices, 1000)):
-        update_price(some_price, client_id, seller_token)
+    await upload_batches(
+        prices,
+        1000,
+        lambda some_price: update_price_async(
+            client, some_price, client_id, seller_token
+        ),
+    )
     return prices
 
 
-async def upload_stocks(watch_remnants, client_id, seller_token):
+async def upload_stocks(client, watch_remnants, offer_ids, client_id, seller_token):
     """Загружает остатки товаров на Ozon.
 
     Args:
-        watch_remnants (list): Данные от поставщика.
+        client (httpx.AsyncClient): Клиент для запросов к API.
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        offer_ids (list): Артикулы товаров магазина (см. get_offer_ids_async()).
         client_id (str): ID клиента для авторизации в API Ozon.
         seller_token (str): API-ключ для Ozon.
 
@@ -307,14 +615,37 @@ async def upload_stocks(watch_remnants, client_id, seller_token):
             not_empty (list): Товары с ненулевым остатком.
             stocks (list): Все товары с остатками.
     """
-    offer_ids = get_offer_ids(client_id, seller_token)
     stocks = create_stocks(watch_remnants, offer_ids)
-    for some_stock in list(divide(stocks, 100)):
-        update_stocks(some_stock, client_id, seller_token)
-    not_empty = list(filter(lambda stock: (stock.get("stock") != 0), stocks))
+    await upload_batches(
+        stocks,
+        100,
+        lambda some_stock: update_stocks_async(
+            client, some_stock, client_id, seller_token
+        ),
+    )
+    not_empty = [stock for stock in stocks if stock["stock"] != 0]
     return not_empty, stocks
 
 
+async def sync_store(watch_remnants, client_id, seller_token):
+    """Обновляет остатки и цены магазина Ozon через общий HTTP/2-клиент.
+
+    Артикулы магазина запрашиваются один раз, после чего остатки и цены
+    загружаются параллельно.
+
+    Args:
+        watch_remnants (pandas.DataFrame): Данные от поставщика.
+        client_id (str): ID клиента для авторизации в API Ozon.
+        seller_token (str): API-ключ для Ozon.
+    """
+    async with create_client() as client:
+        offer_ids = await get_offer_ids_async(client, client_id, seller_token)
+        await asyncio.gather(
+            upload_stocks(client, watch_remnants, offer_ids, client_id, seller_token),
+            upload_prices(client, watch_remnants, offer_ids, client_id, seller_token),
+        )
+
+
 def main():
     """
     Основная функция для запуска синхронизации с Ozon.
@@ -329,19 +660,12 @@ def main():
     seller_token = env.str("SELLER_TOKEN")
     client_id = env.str("CLIENT_ID")
     try:
-        offer_ids = get_offer_ids(client_id, seller_token)
         watch_remnants = download_stock()
-        # Обновить остатки
-        stocks = create_stocks(watch_remnants, offer_ids)
-        for some_stock in list(divide(stocks, 100)):
-            update_stocks(some_stock, client_id, seller_token)
-        # Поменять цены
-        prices = create_prices(watch_remnants, offer_ids)
-        for some_price in list(divide(prices, 900)):
-            update_price(some_price, client_id, seller_token)
-    except requests.exceptions.ReadTimeout:
+        # Обновить остатки и цены
+        asyncio.run(sync_store(watch_remnants, client_id, seller_token))
+    except (requests.exceptions.ReadTimeout, httpx.TimeoutException):
         print("Превышено время ожидания...")
-    except requests.exceptions.ConnectionError as error:
+    except (requests.exceptions.ConnectionError, httpx.ConnectError) as error:
         print(error, "Ошибка соединения")
     except Exception as error:
         print(error, "ERROR_2")